@@ -1,12 +1,289 @@
 #!/usr/bin/env python3
 
+import os
 import sys
+import stat
 import argparse
-import random
+import functools
 import numpy as np
-from itertools import product
+from concurrent.futures import ThreadPoolExecutor
 
-def binary_to_3d_sequential(binary_data, dimensions=(16, 16, 16), fill_empty=True, default_bit=0):
+# Numba is optional: when available, the sequential mapping of large inputs is
+# compiled to native code (imported lazily, see load_numba_kernels)
+prange = range
+
+# CuPy is optional: when available, '--device cuda' runs the mappings on the GPU
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+# Worker threads and minimum positions per chunk for the NumPy sequential mapping
+PARALLEL_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_CHUNK = 1 << 16
+
+# Minimum number of positions for which the Numba kernels are used (below it,
+# importing Numba and launching its threads costs more than it saves)
+NUMBA_MIN_POSITIONS = 1 << 16
+
+# Largest space whose position -> (x, y, z) lookup table is cached for the
+# contiguous slices of the NumPy sequential mapping
+COORD_TABLE_MAX_POSITIONS = 1 << 20
+
+# Number of input bytes mapped per chunk when streaming the sequential mapping
+READ_CHUNK_SIZE = 1 << 16
+
+# Number of output records formatted per write, and the output file buffer size
+WRITE_BATCH_SIZE = 10000
+WRITE_BUFFER_SIZE = 1 << 20
+
+def get_array_module(device="cpu"):
+    """
+    Get the array module used for computations on a device
+    
+    Args:
+        device (str): Device to compute on ('cpu' or 'cuda')
+        
+    Returns:
+        module: numpy for 'cpu', cupy for 'cuda'
+    """
+    if device == "cpu":
+        return np
+    if device == "cuda":
+        if cupy is None:
+            raise ValueError("Device 'cuda' requires CuPy to be installed")
+        return cupy
+    raise ValueError(f"Unknown device '{device}'")
+
+def to_host(arrays):
+    """
+    Copy arrays back to host memory as NumPy arrays
+    
+    Args:
+        arrays (tuple): NumPy or CuPy arrays
+        
+    Returns:
+        tuple: NumPy arrays
+    """
+    if cupy is None:
+        return arrays
+    return tuple(cupy.asnumpy(a) for a in arrays)
+
+def unpack_bits(binary_data, total_positions, xp=np):
+    """
+    Unpack binary data into individual bits, keeping only the bits that fit in the 3D space
+    
+    Args:
+        binary_data (bytes): Binary data to unpack
+        total_positions (int): Number of positions in the 3D space
+        xp (module): Array module to compute with (numpy or cupy)
+        
+    Returns:
+        tuple: Array of bit values (most significant bit first) and the index of the last byte used
+    """
+    # Unpack every byte into its 8 bits (most significant bit first)
+    bits = xp.unpackbits(xp.asarray(np.frombuffer(binary_data, dtype=np.uint8)))
+    
+    # Only keep the bits that fit into the 3D space
+    if len(bits) >= total_positions:
+        return bits[:total_positions], (total_positions - 1) // 8
+    
+    return bits, len(binary_data) - 1
+
+def index_to_coords(positions, dimensions):
+    """
+    Convert flat position indices into 3D coordinates (x varies fastest, then y, then z)
+    
+    Args:
+        positions (numpy.ndarray): Flat position indices
+        dimensions (tuple): The dimensions of the 3D space (x, y, z)
+        
+    Returns:
+        tuple: Arrays (xs, ys, zs) of coordinates
+    """
+    max_x, max_y, max_z = dimensions
+    
+    xs = positions % max_x
+    ys = (positions // max_x) % max_y
+    zs = positions // (max_x * max_y)
+    
+    return xs, ys, zs
+
+@functools.lru_cache(maxsize=2)
+def coord_table(dimensions):
+    """
+    Build a read-only lookup table of the 3D coordinates of every flat position
+    
+    Args:
+        dimensions (tuple): The dimensions of the 3D space (x, y, z)
+        
+    Returns:
+        numpy.ndarray: Array of shape (3, N) holding the x, y and z rows, in the smallest fitting dtype
+    """
+    xs, ys, zs = index_to_coords(np.arange(int(np.prod(dimensions)), dtype=np.int32), dimensions)
+    table = np.stack([xs, ys, zs]).astype(np.min_scalar_type(max(max(dimensions) - 1, 0)))
+    table.flags.writeable = False
+    return table
+
+def sequential_kernel(data, bit_offset, max_x, max_y, default_bit, xs, ys, zs, bits):
+    """
+    Extract bits and compute their sequential 3D positions in a single pass
+    
+    Compiled with Numba (in parallel over positions) by load_numba_kernels.
+    
+    Args:
+        data (numpy.ndarray): Input bytes as a uint8 array
+        bit_offset (int): Position of the first bit of the data in the 3D space
+        max_x, max_y (int): The x and y dimensions of the 3D space
+        default_bit (int): Bit value for positions past the end of the data
+        xs, ys, zs (numpy.ndarray): Output arrays for the coordinates
+        bits (numpy.ndarray): Output array for the bit values
+    """
+    for i in prange(bits.size):
+        byte_idx = i >> 3
+        if byte_idx < data.size:
+            bits[i] = (data[byte_idx] >> (7 - (i & 7))) & 1
+        else:
+            bits[i] = default_bit
+        position = bit_offset + i
+        xs[i] = position % max_x
+        ys[i] = (position // max_x) % max_y
+        zs[i] = position // (max_x * max_y)
+
+def write_ascii_int(buf, pos, value):
+    """
+    Write the decimal digits of a non-negative integer into a byte buffer
+    
+    Args:
+        buf (numpy.ndarray): Output uint8 buffer
+        pos (int): Offset to start writing at
+        value (int): Value to write
+        
+    Returns:
+        int: Offset just past the last digit written
+    """
+    end = pos + 1
+    v = value // 10
+    while v > 0:
+        end += 1
+        v //= 10
+    
+    # Fill in the digits from the least significant one
+    p = end
+    while True:
+        p -= 1
+        buf[p] = 48 + value % 10
+        value //= 10
+        if value == 0:
+            break
+    
+    return end
+
+def format_sequential_kernel(data, bit_offset, n, max_x, max_y, default_bit, out_buf):
+    """
+    Extract bits, compute their sequential 3D positions and format them as
+    "(x, y, z)\tbit_value" text lines in a single pass
+    
+    Compiled with Numba by load_numba_kernels.
+    
+    Args:
+        data (numpy.ndarray): Input bytes as a uint8 array
+        bit_offset (int): Position of the first bit of the data in the 3D space
+        n (int): Number of positions to format
+        max_x, max_y (int): The x and y dimensions of the 3D space
+        default_bit (int): Bit value for positions past the end of the data
+        out_buf (numpy.ndarray): Output uint8 buffer, large enough for n records
+        
+    Returns:
+        int: Number of bytes written to out_buf
+    """
+    pos = 0
+    for i in range(n):
+        byte_idx = i >> 3
+        if byte_idx < data.size:
+            bit = (data[byte_idx] >> (7 - (i & 7))) & 1
+        else:
+            bit = default_bit
+        position = bit_offset + i
+        
+        out_buf[pos] = 40  # "("
+        pos = write_ascii_int(out_buf, pos + 1, position % max_x)
+        out_buf[pos] = 44  # ","
+        out_buf[pos + 1] = 32  # " "
+        pos = write_ascii_int(out_buf, pos + 2, (position // max_x) % max_y)
+        out_buf[pos] = 44  # ","
+        out_buf[pos + 1] = 32  # " "
+        pos = write_ascii_int(out_buf, pos + 2, position // (max_x * max_y))
+        out_buf[pos] = 41  # ")"
+        out_buf[pos + 1] = 9  # "\t"
+        out_buf[pos + 2] = 48 + bit
+        out_buf[pos + 3] = 10  # "\n"
+        pos += 4
+    
+    return pos
+
+@functools.lru_cache(maxsize=None)
+def load_numba_kernels():
+    """
+    Import Numba and compile the sequential kernels on first use
+    
+    Returns:
+        bool: True if Numba is installed and the kernels were compiled
+    """
+    global prange, sequential_kernel, write_ascii_int, format_sequential_kernel
+    
+    try:
+        import numba
+    except ImportError:
+        return False
+    
+    prange = numba.prange
+    sequential_kernel = numba.njit(cache=True, boundscheck=False, parallel=True)(sequential_kernel)
+    write_ascii_int = numba.njit(cache=True, boundscheck=False)(write_ascii_int)
+    format_sequential_kernel = numba.njit(cache=True, boundscheck=False)(format_sequential_kernel)
+    return True
+
+def use_numba(n, device="cpu"):
+    """
+    Check whether the Numba kernels should be used for mapping n positions
+    
+    Args:
+        n (int): Number of positions to map
+        device (str): Device to compute on ('cpu' or 'cuda')
+        
+    Returns:
+        bool: True for large enough CPU workloads when Numba is installed
+    """
+    return device == "cpu" and n >= NUMBA_MIN_POSITIONS and load_numba_kernels()
+
+def fill_sequential_chunk(data, bit_offset, start, stop, dimensions, default_bit, xs, ys, zs, bits):
+    """
+    NumPy equivalent of sequential_kernel for the bits in [start, stop)
+    
+    Args:
+        data (numpy.ndarray): Input bytes as a uint8 array
+        bit_offset (int): Position of the first bit of the data in the 3D space
+        start (int): First bit of the chunk (a multiple of 8)
+        stop (int): End of the chunk (exclusive)
+        dimensions (tuple): The dimensions of the 3D space (x, y, z)
+        default_bit (int): Bit value for positions past the end of the data
+        xs, ys, zs (numpy.ndarray): Output arrays for the coordinates
+        bits (numpy.ndarray): Output array for the bit values
+    """
+    # Unpack only the bytes covering this chunk
+    chunk_bits = np.unpackbits(data[start // 8:(stop + 7) // 8])[:stop - start]
+    bits[start:start + len(chunk_bits)] = chunk_bits
+    bits[start + len(chunk_bits):stop] = default_bit
+    
+    # Calculate the 3D positions of the chunk
+    first, last = bit_offset + start, bit_offset + stop
+    if int(np.prod(dimensions)) <= COORD_TABLE_MAX_POSITIONS:
+        xs[start:stop], ys[start:stop], zs[start:stop] = coord_table(tuple(dimensions))[:, first:last]
+    else:
+        xs[start:stop], ys[start:stop], zs[start:stop] = index_to_coords(np.arange(first, last, dtype=np.int32), dimensions)
+
+def binary_to_3d_sequential(binary_data, dimensions=(16, 16, 16), fill_empty=True, default_bit=0, device="cpu",
+                            bit_offset=0):
     """
     Map binary data to 3D coordinates sequentially
     
@@ -15,55 +292,55 @@ def binary_to_3d_sequential(binary_data, dimensions=(16, 16, 16), fill_empty=Tru
         dimensions (tuple): The dimensions of the 3D space (x, y, z)
         fill_empty (bool): Whether to fill empty positions with default bits
         default_bit (int): Default bit value for empty positions
+        device (str): Device to compute on ('cpu' or 'cuda')
+        bit_offset (int): Position of the first bit of the data, for mapping a file chunk by chunk
         
     Returns:
-        list: List of tuples (x, y, z, bit_value)
+        tuple: Arrays (xs, ys, zs, bits) of coordinates and bit values
     """
     # Get maximum values for each dimension
     max_x, max_y, max_z = dimensions
     
-    # Calculate total bits that will fit in the specified 3D space
-    total_positions = max_x * max_y * max_z
+    # Calculate total bits that will fit in the rest of the 3D space
+    remaining_positions = max(max_x * max_y * max_z - bit_offset, 0)
     
-    # Result list to store coordinates and bit values
-    result = []
+    xp = get_array_module(device)
+    if xp is not np:
+        # Extract the bits and calculate every position on the GPU
+        bits, last_byte_idx = unpack_bits(binary_data, remaining_positions, xp)
+        n = remaining_positions if fill_empty else len(bits)
+        if len(bits) < n:
+            bits = xp.pad(bits, (0, n - len(bits)), constant_values=default_bit)
+        xs, ys, zs = index_to_coords(xp.arange(bit_offset, bit_offset + n, dtype=xp.int32), dimensions)
+        return to_host((xs, ys, zs, bits)), last_byte_idx, len(binary_data)
     
-    # Process each byte in the binary data
-    bit_position = 0
-    for byte_idx, byte in enumerate(binary_data):
-        # Process each bit in the byte
-        for bit_idx in range(8):
-            # Extract the bit (0 or 1)
-            bit = (byte >> (7 - bit_idx)) & 1
-            
-            # Calculate the 3D position
-            position = bit_position % total_positions
-            x = position % max_x
-            y = (position // max_x) % max_y
-            z = position // (max_x * max_y)
-            
-            # Store the coordinates and bit value
-            result.append((x, y, z, bit))
-            
-            # Increment the bit position
-            bit_position += 1
-            
-            # Check if we've filled the entire 3D space
-            if bit_position >= total_positions:
-                return result, byte_idx, len(binary_data)
+    # Number of data bits that fit into the 3D space, plus default bits if filling
+    data_bits = min(len(binary_data) * 8, remaining_positions)
+    n = remaining_positions if fill_empty else data_bits
+    last_byte_idx = (remaining_positions - 1) // 8 if data_bits == remaining_positions else len(binary_data) - 1
+    
+    data = np.frombuffer(binary_data, dtype=np.uint8)
+    xs, ys, zs = (np.empty(n, dtype=np.int32) for _ in range(3))
+    bits = np.empty(n, dtype=np.uint8)
     
-    # If we need to fill the remaining positions
-    if fill_empty and bit_position < total_positions:
-        # Fill the remaining positions with default bit value
-        for position in range(bit_position, total_positions):
-            x = position % max_x
-            y = (position // max_x) % max_y
-            z = position // (max_x * max_y)
-            result.append((x, y, z, default_bit))
+    if use_numba(n):
+        # Extract the bits and calculate their positions in one compiled (parallel) pass
+        sequential_kernel(data, bit_offset, max_x, max_y, default_bit, xs, ys, zs, bits)
+    else:
+        # Every position depends only on its own index, so independent
+        # byte-aligned chunks can be filled concurrently (NumPy releases the GIL)
+        chunk_size = max(-(-n // PARALLEL_WORKERS), PARALLEL_MIN_CHUNK)
+        chunk_size = -(-chunk_size // 8) * 8
+        with ThreadPoolExecutor(max_workers=PARALLEL_WORKERS) as executor:
+            list(executor.map(
+                lambda start: fill_sequential_chunk(data, bit_offset, start, min(start + chunk_size, n), dimensions,
+                                                    default_bit, xs, ys, zs, bits),
+                range(0, n, chunk_size)))
     
-    return result, len(binary_data) - 1, len(binary_data)
+    return (xs, ys, zs, bits), last_byte_idx, len(binary_data)
 
-def binary_to_3d_random_positions(binary_data, dimensions=(16, 16, 16), fill_empty=True, default_bit=0, seed=None):
+def binary_to_3d_random_positions(binary_data, dimensions=(16, 16, 16), fill_empty=True, default_bit=0, seed=None,
+                                  device="cpu"):
     """
     Map binary data to random 3D coordinates
     
@@ -73,58 +350,49 @@ def binary_to_3d_random_positions(binary_data, dimensions=(16, 16, 16), fill_emp
         fill_empty (bool): Whether to fill empty positions with default bits
         default_bit (int): Default bit value for empty positions
         seed (int): Random seed for reproducibility
+        device (str): Device to compute on ('cpu' or 'cuda')
         
     Returns:
-        list: List of tuples (x, y, z, bit_value)
+        tuple: Arrays (xs, ys, zs, bits) of coordinates and bit values, sorted by z, y, x
     """
-    # Set random seed if provided
-    if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
-    
     # Get maximum values for each dimension
     max_x, max_y, max_z = dimensions
     
-    # Generate all possible coordinates
-    all_coords = list(product(range(max_x), range(max_y), range(max_z)))
+    # Calculate total bits that will fit in the specified 3D space
+    total_positions = max_x * max_y * max_z
     
-    # Shuffle the coordinates randomly
-    random.shuffle(all_coords)
+    # Randomly permute the flat indices of all positions
+    xp = get_array_module(device)
+    if xp is np:
+        # Shuffle an int32 index array in place (no int64 permutation copy)
+        perm = np.arange(total_positions, dtype=np.int32)
+        np.random.default_rng(seed).shuffle(perm)
+    else:
+        perm = xp.random.RandomState(seed).permutation(total_positions).astype(xp.int32)
     
-    # Calculate total bits that will fit in the specified 3D space
-    total_positions = len(all_coords)
-    
-    # Result list to store coordinates and bit values
-    result = []
-    
-    # Process each byte in the binary data
-    bit_position = 0
-    for byte_idx, byte in enumerate(binary_data):
-        # Process each bit in the byte
-        for bit_idx in range(8):
-            # Extract the bit (0 or 1)
-            bit = (byte >> (7 - bit_idx)) & 1
-            
-            # Get the next coordinate from the shuffled list
-            if bit_position < total_positions:
-                x, y, z = all_coords[bit_position]
-                
-                # Store the coordinates and bit value
-                result.append((x, y, z, bit))
-                
-                # Increment the bit position
-                bit_position += 1
-            else:
-                return result, byte_idx, len(binary_data)
+    # Extract the bits that fit into the 3D space
+    bits, last_byte_idx = unpack_bits(binary_data, total_positions, xp)
+    
+    # If we need to fill the remaining positions with the default bit value
+    if fill_empty and len(bits) < total_positions:
+        bits = xp.pad(bits, (0, total_positions - len(bits)), constant_values=default_bit)
     
-    # If we need to fill the remaining positions
-    if fill_empty and bit_position < total_positions:
-        # Fill the remaining positions with default bit value
-        for i in range(bit_position, total_positions):
-            x, y, z = all_coords[i]
-            result.append((x, y, z, default_bit))
+    # The i-th bit lands at flat index perm[i]; scattering the bits into a flat
+    # grid yields the positions already sorted by z, y, x without a sort pass
+    targets = perm[:len(bits)]
+    grid = xp.empty(total_positions, dtype=xp.uint8)
+    grid[targets] = bits
+    
+    if len(bits) == total_positions:
+        positions = xp.arange(total_positions, dtype=xp.int32)
+    else:
+        filled = xp.zeros(total_positions, dtype=bool)
+        filled[targets] = True
+        positions = xp.flatnonzero(filled).astype(xp.int32)
     
-    return result, len(binary_data) - 1, len(binary_data)
+    xs, ys, zs = index_to_coords(positions, dimensions)
+    
+    return to_host((xs, ys, zs, grid[positions])), last_byte_idx, len(binary_data)
 
 def binary_to_3d_random_assignment(binary_data, dimensions=(16, 16, 16), fill_empty=True, default_bit=0, seed=None):
     """
@@ -138,67 +406,250 @@ def binary_to_3d_random_assignment(binary_data, dimensions=(16, 16, 16), fill_em
         seed (int): Random seed for reproducibility
         
     Returns:
-        list: List of tuples (x, y, z, bit_value)
+        tuple: Arrays (xs, ys, zs, bits) of coordinates and bit values, sorted by z, y, x
     """
-    # Set random seed if provided
-    if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
-    
     # Get maximum values for each dimension
     max_x, max_y, max_z = dimensions
     
-    # Result dictionary to store coordinates and bit values
-    result_dict = {}
+    # Calculate total bits that will fit in the specified 3D space
+    total_positions = max_x * max_y * max_z
+    
+    # Extract the bits that fit into the 3D space
+    bits, last_byte_idx = unpack_bits(binary_data, total_positions)
+    
+    # Generate a random position within the dimensions for every bit at once
+    rng = np.random.default_rng(seed)
+    coords = rng.integers(0, [max_x, max_y, max_z], size=(len(bits), 3), dtype=np.int32)
+    
+    # Flat index of every target position in a dense grid
+    targets = coords[:, 0] + max_x * (coords[:, 1] + max_y * coords[:, 2])
+    
+    # Find the last bit assigned to each position (later bits overwrite earlier ones)
+    last_writer = np.full(total_positions, -1, dtype=np.int64)
+    np.maximum.at(last_writer, targets, np.arange(len(bits)))
+    filled = last_writer >= 0
+    
+    # Store the bit values in a dense grid, filled with the default bit value
+    grid = np.full(total_positions, default_bit, dtype=np.uint8)
+    grid[filled] = bits[last_writer[filled]]
+    
+    # Emit every position if filling, otherwise only the assigned ones (sorted by z, y, x)
+    if fill_empty:
+        positions = np.arange(total_positions, dtype=np.int32)
+    else:
+        positions = np.flatnonzero(filled).astype(np.int32)
+    
+    xs, ys, zs = index_to_coords(positions, dimensions)
+    
+    return (xs, ys, zs, grid[positions]), last_byte_idx, len(binary_data)
+
+def morton_decode3(codes, axis_bits=(10, 10, 10)):
+    """
+    Decode 3D Morton (Z-order) codes into x, y, z coordinates
+    
+    Bits are interleaved x, y, z from the least significant end. Equal bit counts use
+    the magic-number bit compaction; otherwise an axis that has run out of bits is
+    skipped, so elongated spaces do not need a full cube of codes.
+    
+    Args:
+        codes (numpy.ndarray): Morton codes with interleaved bits
+        axis_bits (tuple): Number of bits of each coordinate (x, y, z), at most 10
+        
+    Returns:
+        tuple: Arrays (xs, ys, zs) of coordinates
+    """
+    codes = np.asarray(codes, dtype=np.uint32)
+    
+    if len(set(axis_bits)) == 1:
+        def compact(v):
+            # Gather every third bit into the low bits (inverse of the magic-number bit spread)
+            v = v & 0x09249249
+            v = (v ^ (v >> 2)) & 0x030C30C3
+            v = (v ^ (v >> 4)) & 0x0300F00F
+            v = (v ^ (v >> 8)) & 0x030000FF
+            v = (v ^ (v >> 16)) & 0x000003FF
+            return v.astype(np.int32)
+        
+        return compact(codes), compact(codes >> 1), compact(codes >> 2)
+    
+    # Elongated spaces: pick the bits of each axis one interleaving level at a time
+    coords = [np.zeros(codes.shape, dtype=np.int32) for _ in range(3)]
+    
+    code_bit = 0
+    for level in range(max(axis_bits)):
+        for axis in range(3):
+            if level < axis_bits[axis]:
+                coords[axis] |= ((codes >> code_bit) & 1).astype(np.int32) << level
+                code_bit += 1
+    
+    return tuple(coords)
+
+def binary_to_3d_morton(binary_data, dimensions=(16, 16, 16), fill_empty=True, default_bit=0):
+    """
+    Map binary data to 3D coordinates following a Morton (Z-order) curve
+    
+    Args:
+        binary_data (bytes): Binary data to map
+        dimensions (tuple): The dimensions of the 3D space (x, y, z), each at most 1024
+        fill_empty (bool): Whether to fill empty positions with default bits
+        default_bit (int): Default bit value for empty positions
+        
+    Returns:
+        tuple: Arrays (xs, ys, zs, bits) of coordinates and bit values
+    """
+    # Get maximum values for each dimension
+    max_x, max_y, max_z = dimensions
+    if max(dimensions) > 1024:
+        raise ValueError("Morton mapping supports at most 1024 positions per dimension")
     
-    # Calculate total bits in the binary data
-    total_bits = len(binary_data) * 8
+    # Calculate total bits that will fit in the specified 3D space
     total_positions = max_x * max_y * max_z
     
-    # Process each byte in the binary data
-    bit_count = 0
-    for byte_idx, byte in enumerate(binary_data):
-        # Process each bit in the byte
-        for bit_idx in range(8):
-            # Extract the bit (0 or 1)
-            bit = (byte >> (7 - bit_idx)) & 1
-            
-            # Generate a random position within the dimensions
-            x = random.randint(0, max_x - 1)
-            y = random.randint(0, max_y - 1)
-            z = random.randint(0, max_z - 1)
-            
-            # Store the coordinates and bit value
-            result_dict[(x, y, z)] = bit
-            
-            # Increment the bit count
-            bit_count += 1
-            
-            # Optional: limit to a maximum number of bits
-            if bit_count >= total_positions:
-                break
+    # Walk the Z-order curve of the enclosing power-of-two box (each axis rounded up
+    # separately, so at most 8x the space), skipping positions outside the space
+    axis_bits = tuple(int(max(d - 1, 0)).bit_length() for d in dimensions)
+    xs, ys, zs = morton_decode3(np.arange(1 << sum(axis_bits), dtype=np.uint32), axis_bits)
+    inside = (xs < max_x) & (ys < max_y) & (zs < max_z)
+    xs, ys, zs = xs[inside], ys[inside], zs[inside]
+    
+    # Extract the bits that fit into the 3D space
+    bits, last_byte_idx = unpack_bits(binary_data, total_positions)
+    
+    # If we need to fill the remaining positions with the default bit value
+    if fill_empty and len(bits) < total_positions:
+        bits = np.pad(bits, (0, total_positions - len(bits)), constant_values=default_bit)
+    
+    # Each bit takes the next position along the curve
+    n = len(bits)
+    
+    return (xs[:n], ys[:n], zs[:n], bits), last_byte_idx, len(binary_data)
+
+def write_coordinates(out_handle, xs, ys, zs, bits, batch_size=WRITE_BATCH_SIZE):
+    """
+    Write coordinates and bit values in the "(x, y, z)\tbit_value" format
+    
+    Args:
+        out_handle (file): Handle of the output file
+        xs, ys, zs (numpy.ndarray): Coordinates of each position
+        bits (numpy.ndarray): Bit value of each position
+        batch_size (int): Number of records formatted into each write call
+    """
+    for start in range(0, len(bits), batch_size):
+        end = start + batch_size
+        records = zip(xs[start:end].tolist(), ys[start:end].tolist(), zs[start:end].tolist(), bits[start:end].tolist())
+        out_handle.write("".join([f"({x}, {y}, {z})\t{bit}\n" for x, y, z, bit in records]))
+
+def write_sequential_chunk(out_handle, binary_data, dimensions, fill_empty=False, default_bit=0, device="cpu",
+                           bit_offset=0):
+    """
+    Map a chunk of binary data sequentially and write it in the "(x, y, z)\tbit_value" format
+    
+    With Numba on the CPU (for large enough chunks), bit extraction, position calculation
+    and formatting are fused into one compiled pass; otherwise the chunk is mapped and then written.
+    
+    Args:
+        out_handle (file): Handle of the output file
+        binary_data (bytes): Binary data to map
+        dimensions (tuple): The dimensions of the 3D space (x, y, z)
+        fill_empty (bool): Whether to fill the rest of the space with default bits
+        default_bit (int): Default bit value for empty positions
+        device (str): Device to compute on ('cpu' or 'cuda')
+        bit_offset (int): Position of the first bit of the data in the 3D space
         
-        if bit_count >= total_positions:
-            break
+    Returns:
+        int: Number of positions written
+    """
+    max_x, max_y, max_z = dimensions
+    remaining_positions = max(max_x * max_y * max_z - bit_offset, 0)
+    n = remaining_positions if fill_empty else min(len(binary_data) * 8, remaining_positions)
     
-    # If we need to fill the remaining positions
-    if fill_empty:
-        # Get all possible coordinates
-        all_coords = list(product(range(max_x), range(max_y), range(max_z)))
+    if not use_numba(n, device):
+        (xs, ys, zs, bits), _, _ = binary_to_3d_sequential(binary_data, dimensions, fill_empty, default_bit, device,
+                                                         bit_offset)
+        write_coordinates(out_handle, xs, ys, zs, bits)
+        return len(bits)
+    
+    # Longest possible record: three coordinates plus "(", ", ", ", ", ")\t", the bit and "\n"
+    record_len = sum(len(str(max(d - 1, 0))) for d in dimensions) + 9
+    out_buf = np.empty(n * record_len, dtype=np.uint8)
+    
+    written = format_sequential_kernel(np.frombuffer(binary_data, dtype=np.uint8), bit_offset, n,
+                                       max_x, max_y, default_bit, out_buf)
+    
+    # Decode straight from the buffer (one copy, no intermediate bytes object) and write
+    # through the text layer so newline translation matches the other output paths
+    out_handle.write(str(out_buf[:written], 'ascii'))
+    
+    return n
+
+def write_packed_bits(out_handle, xs, ys, zs, bits, dimensions, mapping_mode, seed, default_bit=0):
+    """
+    Write bit values as a packed bit array in z, y, x scan order, preceded by a one-line header
+    
+    The header is "NV3D <x> <y> <z> <mapping_mode> <seed>\n" (seed is "none" if not set).
+    Positions without a bit value are stored as the default bit value.
+    
+    Args:
+        out_handle (file): Handle of the output file, opened in binary mode
+        xs, ys, zs (numpy.ndarray): Coordinates of each position
+        bits (numpy.ndarray): Bit value of each position
+        dimensions (tuple): The dimensions of the 3D space (x, y, z)
+        mapping_mode (str): Mapping mode used to produce the positions
+        seed (int): Random seed used to produce the positions
+        default_bit (int): Default bit value for empty positions
+    """
+    max_x, max_y, max_z = dimensions
+    
+    # Scatter the bits into a dense grid in z, y, x scan order
+    grid = np.full(max_x * max_y * max_z, default_bit, dtype=np.uint8)
+    grid[xs.astype(np.int64) + max_x * (ys.astype(np.int64) + max_y * zs.astype(np.int64))] = bits
+    
+    header = f"NV3D {max_x} {max_y} {max_z} {mapping_mode} {'none' if seed is None else seed}\n"
+    out_handle.write(header.encode('ascii'))
+    out_handle.write(np.packbits(grid).tobytes())
+
+def read_packed_bits(input_file):
+    """
+    Read a packed bit file written with write_packed_bits
+    
+    Args:
+        input_file (str): Path to the packed bit file
         
-        # Fill any missing positions with default bit value
-        result = []
-        for x, y, z in all_coords:
-            bit = result_dict.get((x, y, z), default_bit)
-            result.append((x, y, z, bit))
-    else:
-        # Convert dictionary to list
-        result = [(x, y, z, bit) for (x, y, z), bit in result_dict.items()]
+    Returns:
+        tuple: Dimensions (x, y, z), mapping mode, seed and the array of bit values in z, y, x scan order
+    """
+    with open(input_file, 'rb') as f:
+        magic, max_x, max_y, max_z, mapping_mode, seed = f.readline().decode('ascii').split()
+        if magic != "NV3D":
+            raise ValueError(f"'{input_file}' is not a packed bit file")
+        packed = np.frombuffer(f.read(), dtype=np.uint8)
+    
+    dimensions = (int(max_x), int(max_y), int(max_z))
+    bits = np.unpackbits(packed)[:dimensions[0] * dimensions[1] * dimensions[2]]
     
-    return result, len(binary_data) - 1, len(binary_data)
+    return dimensions, mapping_mode, None if seed == "none" else int(seed), bits
+
+def read_chunks(in_handle, limit, chunk_size=READ_CHUNK_SIZE):
+    """
+    Read up to a given number of bytes from a file in chunks
+    
+    Args:
+        in_handle (file): Handle of the input file, opened in binary mode
+        limit (int): Maximum number of bytes to read
+        chunk_size (int): Number of bytes per chunk
+        
+    Yields:
+        bytes: The next chunk of the file
+    """
+    while limit > 0:
+        chunk = in_handle.read(min(chunk_size, limit))
+        if not chunk:
+            break
+        limit -= len(chunk)
+        yield chunk
 
 def binary_to_3d(input_file, output_file=None, dimensions=(16, 16, 16), mapping_mode="sequential", 
-                fill_empty=True, default_bit=0, seed=None):
+                fill_empty=True, default_bit=0, seed=None, device="cpu", packed_bits=False):
     """
     Read a binary file and map each bit to a 3D coordinate.
     
@@ -206,64 +657,112 @@ def binary_to_3d(input_file, output_file=None, dimensions=(16, 16, 16), mapping_
         input_file (str): Path to the input binary file
         output_file (str, optional): Path to the output file. If None, print to stdout
         dimensions (tuple, optional): The dimensions of the 3D space (x, y, z)
-        mapping_mode (str): Mapping mode ('sequential', 'random_positions', 'random_assignment')
+        mapping_mode (str): Mapping mode ('sequential', 'morton', 'random_positions', 'random_assignment')
         fill_empty (bool): Whether to fill empty positions with default bits
         default_bit (int): Default bit value for empty positions
         seed (int): Random seed for reproducibility
+        device (str): Device for the sequential and random_positions mappings ('cpu' or 'cuda')
+        packed_bits (bool): Write a header and packed bit values instead of one text line per position
     """
+    # Packed output on stdout is binary, so diagnostics go to stderr to keep it intact
+    log = sys.stderr if packed_bits and not output_file else sys.stdout
+    
+    # Fall back to the CPU if the GPU libraries are not available
+    if device == "cuda" and cupy is None:
+        print("Warning: CuPy is not installed, falling back to the CPU.", file=log)
+        device = "cpu"
+    
+    total_positions = dimensions[0] * dimensions[1] * dimensions[2]
+    
     # Open binary file for reading
     try:
-        with open(input_file, 'rb') as f:
-            binary_data = f.read()
+        in_handle = open(input_file, 'rb')
+        file_stat = os.fstat(in_handle.fileno())
     except FileNotFoundError:
-        print(f"Error: File '{input_file}' not found.")
+        print(f"Error: File '{input_file}' not found.", file=log)
         sys.exit(1)
     except Exception as e:
-        print(f"Error reading file: {e}")
+        print(f"Error reading file: {e}", file=log)
         sys.exit(1)
 
     # Create output file handle or use stdout
-    out_handle = open(output_file, 'w') if output_file else sys.stdout
-    
-    # Map binary data to 3D coordinates based on the selected mapping mode
-    if mapping_mode == "sequential":
-        result, last_byte_idx, total_bytes = binary_to_3d_sequential(binary_data, dimensions, fill_empty, default_bit)
-    elif mapping_mode == "random_positions":
-        result, last_byte_idx, total_bytes = binary_to_3d_random_positions(binary_data, dimensions, fill_empty, default_bit, seed)
-    elif mapping_mode == "random_assignment":
-        result, last_byte_idx, total_bytes = binary_to_3d_random_assignment(binary_data, dimensions, fill_empty, default_bit, seed)
+    if packed_bits:
+        out_handle = open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) if output_file else sys.stdout.buffer
     else:
-        print(f"Error: Unknown mapping mode '{mapping_mode}'")
-        sys.exit(1)
+        out_handle = open(output_file, 'w', buffering=WRITE_BUFFER_SIZE) if output_file else sys.stdout
     
-    # Sort results by coordinates for better readability (optional)
-    if mapping_mode in ["random_positions", "random_assignment"]:
-        result.sort(key=lambda item: (item[2], item[1], item[0]))  # Sort by z, y, x
+    # Only the bytes whose bits fit into the 3D space are ever read
+    needed_bytes = -(-total_positions // 8)
     
-    # Write the results to the output file
-    for x, y, z, bit in result:
-        out_handle.write(f"({x}, {y}, {z})\t{bit}\n")
+    with in_handle:
+        if mapping_mode == "sequential" and not packed_bits:
+            # Stream the input chunk by chunk, writing each chunk's results before reading the next
+            filled_positions = 0
+            processed_bytes = 0
+            for chunk in read_chunks(in_handle, needed_bytes):
+                processed_bytes += len(chunk)
+                filled_positions += write_sequential_chunk(out_handle, chunk, dimensions, False, default_bit, device,
+                                                           filled_positions)
+            
+            # Fill the remaining positions with the default bit value, one chunk of
+            # default-valued bytes at a time so memory stays bounded by the chunk size
+            if fill_empty:
+                filler = (b"\xff" if default_bit else b"\x00") * READ_CHUNK_SIZE
+                while filled_positions < total_positions:
+                    filled_positions += write_sequential_chunk(out_handle, filler, dimensions, False, default_bit,
+                                                               device, filled_positions)
+        else:
+            binary_data = b"".join(read_chunks(in_handle, needed_bytes))
+            processed_bytes = len(binary_data)
+            
+            # Map binary data to 3D coordinates based on the selected mapping mode
+            if mapping_mode == "sequential":
+                (xs, ys, zs, bits), _, _ = binary_to_3d_sequential(binary_data, dimensions, fill_empty, default_bit, device)
+            elif mapping_mode == "morton":
+                try:
+                    (xs, ys, zs, bits), _, _ = binary_to_3d_morton(binary_data, dimensions, fill_empty, default_bit)
+                except ValueError as e:
+                    print(f"Error: {e}", file=log)
+                    sys.exit(1)
+            elif mapping_mode == "random_positions":
+                (xs, ys, zs, bits), _, _ = binary_to_3d_random_positions(binary_data, dimensions, fill_empty, default_bit, seed, device)
+            elif mapping_mode == "random_assignment":
+                (xs, ys, zs, bits), _, _ = binary_to_3d_random_assignment(binary_data, dimensions, fill_empty, default_bit, seed)
+            else:
+                print(f"Error: Unknown mapping mode '{mapping_mode}'", file=log)
+                sys.exit(1)
+            
+            # Write the results to the output file
+            if packed_bits:
+                write_packed_bits(out_handle, xs, ys, zs, bits, dimensions, mapping_mode, seed, default_bit)
+            else:
+                write_coordinates(out_handle, xs, ys, zs, bits)
+            filled_positions = len(bits)
+        
+        # Regular files report their size; pipes and FIFOs report 0, so count any input left over
+        if stat.S_ISREG(file_stat.st_mode):
+            total_bytes = max(file_stat.st_size, processed_bytes)
+        else:
+            total_bytes = processed_bytes + sum(len(chunk) for chunk in iter(lambda: in_handle.read(READ_CHUNK_SIZE), b""))
     
     # Close the output file if it was opened
     if output_file:
         out_handle.close()
     
     # If we didn't process all bytes, print a warning
-    if last_byte_idx < total_bytes - 1 and not fill_empty:
-        print(f"Warning: Only processed {last_byte_idx + 1} bytes out of {total_bytes} total bytes.")
+    if processed_bytes < total_bytes and not fill_empty:
+        print(f"Warning: Only processed {processed_bytes} bytes out of {total_bytes} total bytes.", file=log)
     
     # Calculate some statistics
-    total_bits = len(binary_data) * 8
-    total_positions = dimensions[0] * dimensions[1] * dimensions[2]
-    filled_positions = len(result)
+    total_bits = total_bytes * 8
     
     # Print a more detailed summary
-    print(f"Successfully mapped data to 3D space:")
-    print(f"  - Input file: {total_bytes} bytes ({total_bits} bits)")
-    print(f"  - 3D space: {dimensions[0]}×{dimensions[1]}×{dimensions[2]} ({total_positions} positions)")
-    print(f"  - Filled positions: {filled_positions} ({filled_positions/total_positions*100:.1f}%)")
+    print(f"Successfully mapped data to 3D space:", file=log)
+    print(f"  - Input file: {total_bytes} bytes ({total_bits} bits)", file=log)
+    print(f"  - 3D space: {dimensions[0]}×{dimensions[1]}×{dimensions[2]} ({total_positions} positions)", file=log)
+    print(f"  - Filled positions: {filled_positions} ({filled_positions/total_positions*100:.1f}%)", file=log)
     if fill_empty and total_bits < total_positions:
-        print(f"  - Positions with default bit value: {total_positions - min(total_bits, total_positions)}")
+        print(f"  - Positions with default bit value: {total_positions - min(total_bits, total_positions)}", file=log)
 
 def parse_args():
     parser = argparse.ArgumentParser(description='Convert binary file data to 3D coordinates')
@@ -271,16 +770,20 @@ def parse_args():
     parser.add_argument('-o', '--output', help='Path to the output file (default: print to stdout)')
     parser.add_argument('-d', '--dimensions', type=int, nargs=3, default=[16, 16, 16],
                         help='Dimensions of the 3D space as "x y z" (default: 16 16 16)')
-    parser.add_argument('-m', '--mode', choices=['sequential', 'random_positions', 'random_assignment'], 
+    parser.add_argument('-m', '--mode', choices=['sequential', 'morton', 'random_positions', 'random_assignment'], 
                         default='sequential', help='Mapping mode (default: sequential)')
     parser.add_argument('--no-fill', action='store_true', 
                         help='Do not fill empty positions with default bit value')
     parser.add_argument('--default-bit', type=int, choices=[0, 1], default=0,
                         help='Default bit value for empty positions (default: 0)')
     parser.add_argument('--seed', type=int, help='Random seed for reproducibility')
+    parser.add_argument('--device', choices=['cpu', 'cuda'], default='cpu',
+                        help='Device for the sequential and random_positions mappings (default: cpu)')
+    parser.add_argument('--packed-bits', action='store_true',
+                        help='Write a header and packed bit values in z, y, x order instead of text lines')
     return parser.parse_args()
 
 if __name__ == '__main__':
     args = parse_args()
     binary_to_3d(args.input_file, args.output, tuple(args.dimensions), args.mode, 
-                 not args.no_fill, args.default_bit, args.seed) 
\ No newline at end of file
+                 not args.no_fill, args.default_bit, args.seed, args.device, args.packed_bits) 
\ No newline at end of file
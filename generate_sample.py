@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 import os
-import random
 import argparse
 import numpy as np
 
@@ -14,12 +13,11 @@ def generate_random_binary_file(output_file, size_bytes=64, seed=None):
         size_bytes (int): Size of the file in bytes
         seed (int): Random seed for reproducibility (None for true randomness)
     """
-    # Set random seed if provided
-    if seed is not None:
-        random.seed(seed)
-        
-    # Generate random bytes
-    random_bytes = bytearray(random.getrandbits(8) for _ in range(size_bytes))
+    # Generate random bytes, reproducibly if a seed is provided
+    if seed is None:
+        random_bytes = os.urandom(size_bytes)
+    else:
+        random_bytes = np.random.default_rng(seed).bytes(size_bytes)
     
     # Write to file
     with open(output_file, 'wb') as f:
@@ -44,7 +42,7 @@ def generate_truly_random_binary_file(output_file, size_bytes=64):
     
     print(f"Generated truly random binary file '{output_file}' ({size_bytes} bytes)")
 
-def generate_pattern_binary_file(output_file, pattern_type="checkerboard", size_bytes=64):
+def generate_pattern_binary_file(output_file, pattern_type="checkerboard", size_bytes=64, seed=None):
     """
     Generate a binary file with a specific pattern for testing purposes.
     
@@ -52,6 +50,7 @@ def generate_pattern_binary_file(output_file, pattern_type="checkerboard", size_
         output_file (str): Path to the output binary file
         pattern_type (str): Type of pattern ('checkerboard', 'gradient', 'zeros', 'ones')
         size_bytes (int): Size of the file in bytes
+        seed (int): Random seed for the random parts of 'random_patterns'
     """
     if pattern_type == "checkerboard":
         # Alternating 0s and 1s (binary: 10101010)
@@ -59,7 +58,7 @@ def generate_pattern_binary_file(output_file, pattern_type="checkerboard", size_
         pattern_bytes = bytearray([byte_value] * size_bytes)
     elif pattern_type == "gradient":
         # Increasing values from 0 to 255 and then wrapping
-        pattern_bytes = bytearray(i % 256 for i in range(size_bytes))
+        pattern_bytes = (np.arange(size_bytes) & 0xFF).astype(np.uint8).tobytes()
     elif pattern_type == "zeros":
         # All zeros
         pattern_bytes = bytearray([0] * size_bytes)
@@ -68,20 +67,25 @@ def generate_pattern_binary_file(output_file, pattern_type="checkerboard", size_
         pattern_bytes = bytearray([255] * size_bytes)
     elif pattern_type == "random_patterns":
         # Random patterns with various bit distributions
-        pattern_bytes = bytearray()
-        for i in range(size_bytes):
-            if i % 4 == 0:
-                # Every 4th byte is random
-                pattern_bytes.append(random.getrandbits(8))
-            elif i % 4 == 1:
-                # Alternate between all zeros and all ones
-                pattern_bytes.append(0 if i % 8 < 4 else 255)
-            elif i % 4 == 2:
-                # Alternate bits within a byte
-                pattern_bytes.append(0xAA if i % 8 < 4 else 0x55)
-            else:
-                # Gradient pattern
-                pattern_bytes.append(i % 256)
+        idx = np.arange(size_bytes)
+        first_half = (idx % 8) < 4
+        
+        # Gradient pattern by default (every 4th byte, starting at the 4th)
+        pattern = (idx & 0xFF).astype(np.uint8)
+        
+        # Every 4th byte is random
+        mask = (idx % 4) == 0
+        pattern[mask] = np.random.default_rng(seed).integers(0, 256, mask.sum(), dtype=np.uint8)
+        
+        # Alternate between all zeros and all ones
+        mask = (idx % 4) == 1
+        pattern[mask] = np.where(first_half[mask], 0, 255)
+        
+        # Alternate bits within a byte
+        mask = (idx % 4) == 2
+        pattern[mask] = np.where(first_half[mask], 0xAA, 0x55)
+        
+        pattern_bytes = pattern.tobytes()
     else:
         print(f"Unknown pattern type: {pattern_type}")
         return
@@ -102,20 +106,13 @@ def generate_custom_distribution_file(output_file, p_one=0.5, size_bytes=64, see
         size_bytes (int): Size of the file in bytes
         seed (int): Random seed for reproducibility
     """
-    if seed is not None:
-        np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
-    # Generate bits with the specified probability
-    bits = np.random.choice([0, 1], size=size_bytes*8, p=[1-p_one, p_one])
+    # Generate bits with the specified probability by thresholding uniform samples
+    bits = rng.random(size_bytes*8, dtype=np.float32) < p_one
     
-    # Convert bits to bytes
-    bytes_data = bytearray()
-    for i in range(0, len(bits), 8):
-        byte = 0
-        for j in range(min(8, len(bits) - i)):
-            if bits[i + j]:
-                byte |= (1 << (7 - j))
-        bytes_data.append(byte)
+    # Convert bits to bytes (packbits accepts the boolean array directly)
+    bytes_data = np.packbits(bits).tobytes()
     
     # Write to file
     with open(output_file, 'wb') as f:
@@ -145,4 +142,4 @@ if __name__ == '__main__':
     elif args.type == 'custom':
         generate_custom_distribution_file(args.output, args.probability, args.size, args.seed)
     else:
-        generate_pattern_binary_file(args.output, args.type, args.size)
\ No newline at end of file
+        generate_pattern_binary_file(args.output, args.type, args.size, args.seed)
\ No newline at end of file